@@ -1,3 +1,10 @@
-from .loader import FitDataLoader
-
 __all__ = ['FitDataLoader']
+
+
+def __getattr__(name):
+    # Lazy re-export (PEP 562): importing the package stays cheap; the
+    # loader module (and pandas/fitparse behind it) loads on first use.
+    if name == 'FitDataLoader':
+        from .loader import FitDataLoader
+        return FitDataLoader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,27 +1,113 @@
 import os
 import json
+import sys
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
 import logging
 
+# slots=True drops the per-instance __dict__, shrinking the config objects
+# and speeding attribute access — but the dataclass keyword only exists on
+# Python >= 3.10, and CI still runs older interpreters. Those get plain
+# dataclasses; behavior is identical either way.
+_DATACLASS_KWARGS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 try:
     import yaml
+    try:
+        # libyaml-backed loader/dumper; falls back to the pure-Python
+        # implementations when PyYAML was built without C extensions.
+        from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def _json_loads(data: str) -> Any:
+    """Parse JSON text, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to JSON text, using orjson when available."""
+    if HAS_ORJSON:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
 logger = logging.getLogger(__name__)
 
+# Candidate config files searched by ConfigManager.load. The locations are
+# static, so the tuple (and the ~ expansion) is built once at import. JSON
+# comes first in each directory because it parses fastest (see from_file).
+_DEFAULT_CONFIG_PATHS = (
+    tuple(Path('fitanalysis' + ext) for ext in ('.json', '.yaml', '.yml'))
+    + tuple(Path('config', 'fitanalysis' + ext) for ext in ('.json', '.yaml', '.yml'))
+    + tuple(Path('~/.fitanalysis' + ext).expanduser() for ext in ('.json', '.yaml', '.yml'))
+)
+
+# Environment values treated as "enabled" for boolean settings.
+_TRUE_VALUES = frozenset({'true', '1', 'yes', 'on'})
 
-@dataclass
+# Cache of parsed config dicts keyed by (path, mtime_ns, size) so repeated
+# loads of an unchanged file skip the YAML/JSON parse entirely.
+_PARSE_CACHE: Dict[Any, Dict[str, Any]] = {}
+
+# Directory listings keyed by (path, mtime_ns) so the config search does one
+# scandir per directory instead of one stat per candidate file.
+_DIR_LISTING_CACHE: Dict[Any, frozenset] = {}
+
+
+def _dir_listing(directory: str) -> frozenset:
+    """Return the filenames in a directory, cached on the directory mtime."""
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return frozenset()
+
+    key = (directory, mtime)
+    listing = _DIR_LISTING_CACHE.get(key)
+    if listing is None:
+        try:
+            with os.scandir(directory) as entries:
+                listing = frozenset(entry.name for entry in entries)
+        except OSError:
+            listing = frozenset()
+        _DIR_LISTING_CACHE[key] = listing
+    return listing
+
+
+@dataclass(**_DATACLASS_KWARGS)
 class DatabaseConfig:
     """Database configuration settings."""
     path: str = 'fit_metadata.db'
     read_only: bool = False
+    pragmas: Optional[Dict[str, Any]] = None
+
+    def __post_init__(self):
+        if self.pragmas is None:
+            # Tuned for the append-heavy metadata workload: insertion
+            # order is never relied on by queries, and a higher
+            # checkpoint threshold avoids WAL checkpoint stalls during
+            # large syncs. Override any of these in the config file.
+            self.pragmas = {
+                'preserve_insertion_order': False,
+                'checkpoint_threshold': '1GB',
+                'memory_limit': '2GB',
+            }
 
 
-@dataclass
+@dataclass(**_DATACLASS_KWARGS)
 class GarminConfig:
     """Garmin Connect API configuration."""
     email: Optional[str] = None
@@ -30,7 +116,7 @@ class GarminConfig:
     max_retries: int = 3
 
 
-@dataclass
+@dataclass(**_DATACLASS_KWARGS)
 class WebConfig:
     """Web API configuration."""
     host: str = '127.0.0.1'
@@ -44,7 +130,7 @@ class WebConfig:
             self.allowed_extensions = ['.fit']
 
 
-@dataclass
+@dataclass(**_DATACLASS_KWARGS)
 class LoggingConfig:
     """Logging configuration."""
     level: str = 'INFO'
@@ -52,7 +138,7 @@ class LoggingConfig:
     file_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_KWARGS)
 class FitAnalysisConfig:
     """Main configuration class."""
     database: DatabaseConfig
@@ -62,11 +148,22 @@ class FitAnalysisConfig:
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'FitAnalysisConfig':
-        """Create config from a dictionary."""
+        """Create config from a dictionary.
+
+        Nested mutable values are copied so configs built from a shared
+        dict (the parse cache in from_file) never alias each other's
+        pragmas or extension lists.
+        """
+        database = dict(config_dict.get('database', {}))
+        if database.get('pragmas') is not None:
+            database['pragmas'] = dict(database['pragmas'])
+        web = dict(config_dict.get('web', {}))
+        if web.get('allowed_extensions') is not None:
+            web['allowed_extensions'] = list(web['allowed_extensions'])
         return cls(
-            database=DatabaseConfig(**config_dict.get('database', {})),
+            database=DatabaseConfig(**database),
             garmin=GarminConfig(**config_dict.get('garmin', {})),
-            web=WebConfig(**config_dict.get('web', {})),
+            web=WebConfig(**web),
             logging=LoggingConfig(**config_dict.get('logging', {}))
         )
 
@@ -78,18 +175,27 @@ class FitAnalysisConfig:
         if not config_path.exists():
             logger.warning(f"Config file {config_path} not found. Using default configuration.")
             return cls.default()
-        
+
         try:
-            with open(config_path, 'r') as f:
-                if config_path.suffix.lower() in ['.yaml', '.yml']:
-                    if not HAS_YAML:
-                        raise ValueError("PyYAML is required to load YAML config files. Install with: pip install pyyaml")
-                    config_dict = yaml.safe_load(f)
-                elif config_path.suffix.lower() == '.json':
-                    config_dict = json.load(f)
-                else:
-                    raise ValueError(f"Unsupported config file format: {config_path.suffix}")
-            
+            stat = config_path.stat()
+            cache_key = (str(config_path), stat.st_mtime_ns, stat.st_size)
+            cached = _PARSE_CACHE.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Using cached parse of config file {config_path}")
+                return cls.from_dict(cached)
+
+            suffix = config_path.suffix.lower()
+            if suffix in ['.yaml', '.yml']:
+                if not HAS_YAML:
+                    raise ValueError("PyYAML is required to load YAML config files. Install with: pip install pyyaml")
+                config_dict = cls._load_yaml_with_json_cache(config_path)
+            elif suffix == '.json':
+                with open(config_path, 'r') as f:
+                    config_dict = _json_loads(f.read())
+            else:
+                raise ValueError(f"Unsupported config file format: {config_path.suffix}")
+
+            _PARSE_CACHE[cache_key] = config_dict
             return cls.from_dict(config_dict)
         
         except Exception as e:
@@ -97,34 +203,66 @@ class FitAnalysisConfig:
             logger.info("Using default configuration.")
             return cls.default()
 
+    @staticmethod
+    def _load_yaml_with_json_cache(config_path: Path) -> Dict[str, Any]:
+        """
+        Load a YAML config, using a sibling JSON "fast cache" when fresh.
+
+        YAML parsing is much slower than JSON, so after parsing a YAML file
+        we write its dict to ``<file>.json.cache``. On subsequent loads the
+        cache is used as long as it is at least as new as the YAML source.
+        """
+        cache_path = config_path.parent / (config_path.name + '.json.cache')
+
+        try:
+            if cache_path.exists() and cache_path.stat().st_mtime >= config_path.stat().st_mtime:
+                with open(cache_path, 'r') as f:
+                    return _json_loads(f.read())
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable config cache {cache_path}: {e}")
+
+        with open(config_path, 'r') as f:
+            config_dict = yaml.load(f.read(), Loader=_YamlLoader)
+
+        try:
+            with open(cache_path, 'w') as f:
+                f.write(_json_dumps(config_dict))
+        except OSError as e:
+            logger.debug(f"Could not write config cache {cache_path}: {e}")
+
+        return config_dict
+
     @classmethod
     def from_env(cls) -> 'FitAnalysisConfig':
         """Load configuration from environment variables."""
+        # Read through a single bound environ.get to avoid repeated os.getenv
+        # attribute lookups across the dozen settings below.
+        env = os.environ.get
         config_dict = {
             'database': {
-                'path': os.getenv('FITANALYSIS_DB_PATH', 'fit_metadata.db'),
-                'read_only': os.getenv('FITANALYSIS_DB_READ_ONLY', 'false').lower() == 'true'
+                'path': env('FITANALYSIS_DB_PATH', 'fit_metadata.db'),
+                'read_only': env('FITANALYSIS_DB_READ_ONLY', 'false').lower() in _TRUE_VALUES
             },
             'garmin': {
-                'email': os.getenv('GARMIN_EMAIL'),
-                'password': os.getenv('GARMIN_PASSWORD'),
-                'rate_limit_delay': float(os.getenv('GARMIN_RATE_LIMIT_DELAY', '1.0')),
-                'max_retries': int(os.getenv('GARMIN_MAX_RETRIES', '3'))
+                'email': env('GARMIN_EMAIL'),
+                'password': env('GARMIN_PASSWORD'),
+                'rate_limit_delay': float(env('GARMIN_RATE_LIMIT_DELAY', '1.0')),
+                'max_retries': int(env('GARMIN_MAX_RETRIES', '3'))
             },
             'web': {
-                'host': os.getenv('FITANALYSIS_WEB_HOST', '127.0.0.1'),
-                'port': int(os.getenv('FITANALYSIS_WEB_PORT', '8000')),
-                'max_file_size': int(os.getenv('FITANALYSIS_MAX_FILE_SIZE', str(100 * 1024 * 1024))),
-                'temp_dir': os.getenv('FITANALYSIS_TEMP_DIR'),
-                'allowed_extensions': os.getenv('FITANALYSIS_ALLOWED_EXTENSIONS', '.fit').split(',')
+                'host': env('FITANALYSIS_WEB_HOST', '127.0.0.1'),
+                'port': int(env('FITANALYSIS_WEB_PORT', '8000')),
+                'max_file_size': int(env('FITANALYSIS_MAX_FILE_SIZE', str(100 * 1024 * 1024))),
+                'temp_dir': env('FITANALYSIS_TEMP_DIR'),
+                'allowed_extensions': env('FITANALYSIS_ALLOWED_EXTENSIONS', '.fit').split(',')
             },
             'logging': {
-                'level': os.getenv('FITANALYSIS_LOG_LEVEL', 'INFO'),
-                'format': os.getenv('FITANALYSIS_LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
-                'file_path': os.getenv('FITANALYSIS_LOG_FILE')
+                'level': env('FITANALYSIS_LOG_LEVEL', 'INFO'),
+                'format': env('FITANALYSIS_LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(message)s'),
+                'file_path': env('FITANALYSIS_LOG_FILE')
             }
         }
-        
+
         return cls.from_dict(config_dict)
 
     @classmethod
@@ -139,7 +277,33 @@ class FitAnalysisConfig:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert the configuration to a dictionary."""
-        return asdict(self)
+        # Built explicitly rather than via dataclasses.asdict, which
+        # deep-copies every field recursively.
+        return {
+            'database': {
+                'path': self.database.path,
+                'read_only': self.database.read_only,
+                'pragmas': dict(self.database.pragmas)
+            },
+            'garmin': {
+                'email': self.garmin.email,
+                'password': self.garmin.password,
+                'rate_limit_delay': self.garmin.rate_limit_delay,
+                'max_retries': self.garmin.max_retries
+            },
+            'web': {
+                'host': self.web.host,
+                'port': self.web.port,
+                'max_file_size': self.web.max_file_size,
+                'allowed_extensions': list(self.web.allowed_extensions),
+                'temp_dir': self.web.temp_dir
+            },
+            'logging': {
+                'level': self.logging.level,
+                'format': self.logging.format,
+                'file_path': self.logging.file_path
+            }
+        }
 
     def save_to_file(self, config_path: str) -> None:
         """Save the configuration to a file."""
@@ -151,9 +315,9 @@ class FitAnalysisConfig:
                 if config_path.suffix.lower() in ['.yaml', '.yml']:
                     if not HAS_YAML:
                         raise ValueError("PyYAML is required to save YAML config files. Install with: pip install pyyaml")
-                    yaml.dump(config_dict, f, default_flow_style=False)
+                    yaml.dump(config_dict, f, Dumper=_YamlDumper, default_flow_style=False)
                 elif config_path.suffix.lower() == '.json':
-                    json.dump(config_dict, f, indent=2)
+                    f.write(_json_dumps(config_dict, indent=True))
                 else:
                     raise ValueError(f"Unsupported config file format: {config_path.suffix}")
             
@@ -179,22 +343,10 @@ class ConfigManager:
         if self.config_path:
             self._config = FitAnalysisConfig.from_file(self.config_path)
         else:
-            possible_paths = [
-                'fitanalysis.yaml',
-                'fitanalysis.yml',
-                'fitanalysis.json',
-                'config/fitanalysis.yaml',
-                'config/fitanalysis.yml',
-                'config/fitanalysis.json',
-                os.path.expanduser('~/.fitanalysis.yaml'),
-                os.path.expanduser('~/.fitanalysis.yml'),
-                os.path.expanduser('~/.fitanalysis.json')
-            ]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
+            for path in _DEFAULT_CONFIG_PATHS:
+                if path.name in _dir_listing(str(path.parent)):
                     logger.info(f"Found config file at {path}, loading.")
-                    self._config = FitAnalysisConfig.from_file(path)
+                    self._config = FitAnalysisConfig.from_file(str(path))
                     break
             else:
                 logger.info("No config file found. Loading from environment variables.")
@@ -210,6 +362,8 @@ class ConfigManager:
     
     def reload(self) -> FitAnalysisConfig:
         """Reload the configuration."""
+        global _CACHED_CONFIG
+        _CACHED_CONFIG = None
         self._config = None
         return self.load()
 
@@ -217,26 +371,57 @@ class ConfigManager:
 # Global config manager instance
 config_manager = ConfigManager()
 
+# Fastpath cache for get_config(); cleared by ConfigManager.reload.
+_CACHED_CONFIG: Optional[FitAnalysisConfig] = None
+
 
 def get_config() -> FitAnalysisConfig:
     """Get the current configuration."""
-    return config_manager.get()
+    global _CACHED_CONFIG
+    config = _CACHED_CONFIG
+    if config is None:
+        config = _CACHED_CONFIG = config_manager.get()
+    return config
+
+
+_LEVEL_MAP = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL
+}
+
+# basicConfig is a silent no-op once handlers exist; track whether we have
+# configured logging so repeat calls return early instead of pretending.
+_LOGGING_CONFIGURED = False
 
 
-def setup_logging(config: Optional[FitAnalysisConfig] = None) -> None:
-    """Set up logging based on the configuration."""
+def setup_logging(config: Optional[FitAnalysisConfig] = None, force: bool = False) -> None:
+    """
+    Set up logging based on the configuration.
+
+    Repeat calls are no-ops unless ``force`` is True, in which case the root
+    logger is reconfigured with the current settings.
+    """
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED and not force:
+        return
+
     if config is None:
         config = get_config()
-    
-    log_level = getattr(logging, config.logging.level.upper(), logging.INFO)
-    
+
+    log_level = _LEVEL_MAP.get(config.logging.level.upper(), logging.INFO)
+
     logging.basicConfig(
         level=log_level,
         format=config.logging.format,
         filename=config.logging.file_path,
-        filemode='a' if config.logging.file_path else None
+        filemode='a' if config.logging.file_path else None,
+        force=force
     )
-    
+    _LOGGING_CONFIGURED = True
+
     logger.info(f"Logging configured with level: {config.logging.level}")
 
 
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import duckdb
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = 4
+
+_POOLS: Dict[Tuple[str, bool], "ConnectionPool"] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DuckDB connections to a single database file.
+
+    Connections are opened lazily up to the pool size and reused across
+    acquisitions, so concurrent callers (e.g. overlapping web requests)
+    skip the per-request connect cost. DuckDB keeps one database instance
+    per file within a process, so the pooled handles share storage and
+    see each other's committed writes.
+
+    Note that a read_only pool cannot coexist with read-write handles on
+    the same file in one process — DuckDB rejects mixed configurations —
+    so only request one for databases this process never writes.
+    """
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE, read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self._size = size
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+
+    def _open(self) -> "duckdb.DuckDBPyConnection":
+        # Deferred import, matching MetadataStore: duckdb only loads once
+        # a connection is actually needed.
+        import duckdb
+        conn = duckdb.connect(database=self.db_path, read_only=self.read_only)
+        logger.debug(f"Opened pooled connection {self._created + 1}/{self._size} to {self.db_path}")
+        return conn
+
+    @contextmanager
+    def acquire(self):
+        """Yields a connection, blocking once all pooled handles are out."""
+        if self._closed:
+            raise RuntimeError(f"Connection pool for {self.db_path} is closed")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if self._created < self._size:
+                    conn = self._open()
+                    self._created += 1
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            # Checked under the lock so a close() racing with this return
+            # either drains the handle from the idle queue or sees the
+            # closed flag here — it never survives open either way.
+            with self._lock:
+                if self._closed:
+                    self._created -= 1
+                    try:
+                        conn.close()
+                    except Exception as e:
+                        logger.warning(f"Error closing pooled connection to {self.db_path}: {e}")
+                else:
+                    self._idle.put(conn)
+
+    def close(self):
+        """
+        Closes all idle connections and marks the pool closed.
+
+        Handles still checked out are closed as they are returned, and
+        further acquire() calls raise RuntimeError; get_pool() replaces a
+        closed pool with a fresh one.
+        """
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled connection to {self.db_path}: {e}")
+                self._created -= 1
+
+
+def get_pool(db_path: str, read_only: bool = False) -> ConnectionPool:
+    """Returns the process-wide pool for a database path, creating it lazily."""
+    key = (db_path, read_only)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None or pool._closed:
+            pool = ConnectionPool(db_path, read_only=read_only)
+            _POOLS[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Closes and deregisters every pool; see MetadataStore.shutdown()."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
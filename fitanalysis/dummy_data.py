@@ -1,39 +1,75 @@
 
+import os
+
+import numpy as np
 import pandas as pd
 from fitparse import FitParseError
 
+# Source data as plain (timestamp, heart_rate, power) tuples; the record
+# objects below are materialized from these once at import time.
+_DUMMY = (
+    ('2020-01-01T00:00:00Z', 100, 150),
+    ('2020-01-01T00:00:01Z', 101, 151),
+    ('2020-01-01T00:00:02Z', None, 152),
+)
+_POWER_ONLY = (
+    ('2025-07-05T10:00:00Z', None, 200),
+    ('2025-07-05T10:00:01Z', None, 201),
+)
+_HR_ONLY = (
+    ('2025-07-05T10:00:00Z', 120, None),
+    ('2025-07-05T10:00:01Z', 121, None),
+)
+
+
 class DummyRecord:
-    def __init__(self, timestamp, hr=None, power=None):
-        self._values = {'timestamp': pd.to_datetime(timestamp)}
-        if hr is not None:
-            self._values['heart_rate'] = hr
-        if power is not None:
-            self._values['power'] = power
+    """Thin view over a prebuilt values dict, mirroring fitparse's record API."""
+
+    __slots__ = ('_values',)
+
+    def __init__(self, values):
+        self._values = values
 
     def get_value(self, key):
         return self._values.get(key)
 
+    def get_values(self):
+        return self._values
+
+
+def _build_records(rows):
+    records = []
+    for timestamp, hr, power in rows:
+        # numpy's ISO-8601 parser is much cheaper than pd.to_datetime; the
+        # fixtures use UTC 'Z' suffixes, which numpy does not accept, so
+        # strip it and localize explicitly.
+        values = {'timestamp': pd.Timestamp(np.datetime64(timestamp.rstrip('Z')), tz='UTC')}
+        if hr is not None:
+            values['heart_rate'] = hr
+        if power is not None:
+            values['power'] = power
+        records.append(DummyRecord(values))
+    return tuple(records)
+
+
+# Fixture records are built once at import time; get_messages is then a
+# single dict lookup with no per-call timestamp parsing or allocation.
+_FIXTURES = {
+    'dummy.fit': _build_records(_DUMMY),
+    'power_only.fit': _build_records(_POWER_ONLY),
+    'hr_only.fit': _build_records(_HR_ONLY),
+    'empty.fit': (),
+}
 
-import os
 
 class DummyFitFile:
     def __init__(self, file_path):
-        self.file_path = file_path
+        # fitparse accepts either a path or a file-like object; mirror that
+        # by falling back to the stream's name attribute.
+        self.file_path = getattr(file_path, 'name', file_path)
 
     def get_messages(self, msg_type):
         file_name = os.path.basename(self.file_path)
-        if file_name == 'dummy.fit':
-            return [
-                DummyRecord('2020-01-01T00:00:00Z', hr=100, power=150),
-                DummyRecord('2020-01-01T00:00:01Z', hr=101, power=151),
-                DummyRecord('2020-01-01T00:00:02Z', hr=None, power=152),
-            ]
-        elif file_name == 'power_only.fit':
-            return [DummyRecord('2025-07-05T10:00:00Z', power=200), DummyRecord('2025-07-05T10:00:01Z', power=201)]
-        elif file_name == 'hr_only.fit':
-            return [DummyRecord('2025-07-05T10:00:00Z', hr=120), DummyRecord('2025-07-05T10:00:01Z', hr=121)]
-        elif file_name == 'empty.fit':
-            return []
-        elif file_name == 'corrupt.fit':
+        if file_name == 'corrupt.fit':
             raise FitParseError("Corrupted file")
-        return []
+        return _FIXTURES.get(file_name, ())
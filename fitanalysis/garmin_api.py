@@ -1,4 +1,6 @@
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import datetime
 import os
 from getpass import getpass
@@ -14,10 +16,15 @@ from garminconnect import (
     GarminConnectAuthenticationError,
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=1)
+def _ensure_dotenv() -> None:
+    """Parse the .env file once per process, and only when needed."""
+    load_dotenv()
+
+
 class GarminConnectAPI:
     """A wrapper for the Garmin Connect API to download FIT files."""
 
@@ -31,8 +38,6 @@ class GarminConnectAPI:
             db_path: Path to the metadata database.
             config: A FitAnalysisConfig object.
         """
-        load_dotenv()  # Load environment variables from .env file
-
         if config is None:
             config = get_config()
 
@@ -40,41 +45,51 @@ class GarminConnectAPI:
         self._email = email
         self._password = password
         self._client: Optional[Garmin] = None
+        self._fit_format: Optional[Any] = None
         
         db_path = db_path or self._config.database.path
         self.metadata_store = MetadataStore(db_path=db_path)
 
-    @property
+        # Bulk downloads buffer metadata here and flush it in one
+        # transaction instead of committing per activity.
+        self._batch_metadata = False
+        self._pending_metadata: List[tuple] = []
+
+    @functools.cached_property
     def client(self) -> Garmin:
         """
         Returns a logged-in Garmin Connect client.
-        If the client is not logged in, it will prompt for credentials and log in.
+
+        The login runs once per instance; afterwards the cached client is a
+        plain attribute read. ``logout`` invalidates the cache.
         """
-        if self._client is None:
-            email = self._email or self._config.garmin.email or os.getenv("GARMIN_EMAIL")
-            password = self._password or self._config.garmin.password or os.getenv("GARMIN_PASSWORD")
-
-            if not email:
-                email = input("Enter your Garmin Connect email: ")
-            if not password:
-                password = getpass("Enter your Garmin Connect password: ")
-
-            try:
-                self._client = Garmin(email, password)
-                self._client.login()
-                logger.info(f"Successfully logged in to Garmin Connect as {self._client.display_name}.")
-            except GarminConnectAuthenticationError as e:
-                logger.error(f"Authentication failed for user {email}: {e}")
-                raise
-            except GarminConnectConnectionError as e:
-                logger.error(f"Connection error during login: {e}")
-                raise
-            except GarminConnectTooManyRequestsError as e:
-                logger.error(f"Too many requests during login: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"An unexpected error occurred during login: {e}")
-                raise
+        email = self._email or self._config.garmin.email
+        password = self._password or self._config.garmin.password
+        if not email or not password:
+            # Only pay for the .env parse when credentials were not
+            # supplied explicitly or via the config.
+            _ensure_dotenv()
+            email = email or os.getenv("GARMIN_EMAIL")
+            password = password or os.getenv("GARMIN_PASSWORD")
+
+        if not email:
+            email = input("Enter your Garmin Connect email: ")
+        if not password:
+            password = getpass("Enter your Garmin Connect password: ")
+
+        try:
+            self._client = Garmin(email, password)
+            self._client.login()
+            # Resolve the download-format enum once; download_activity_fit
+            # reads it per call and the chain is three lookups deep.
+            self._fit_format = self._client.ActivityDownloadFormat.FIT
+            logger.info(f"Successfully logged in to Garmin Connect as {self._client.display_name}.")
+        except (GarminConnectAuthenticationError, GarminConnectConnectionError, GarminConnectTooManyRequestsError) as e:
+            logger.error("%s during login for user %s: %s", type(e).__name__, email, e)
+            raise
+        except Exception as e:
+            logger.error("An unexpected error occurred during login: %s", e)
+            raise
         return self._client
 
     def get_activities_by_date(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
@@ -92,14 +107,11 @@ class GarminConnectAPI:
             activities = self.client.get_activities_by_date(start_date, end_date)
             logger.info(f"Fetched {len(activities)} activities from {start_date} to {end_date}.")
             return activities
-        except GarminConnectConnectionError as e:
-            logger.error(f"Connection error while fetching activities: {e}")
-            raise
-        except GarminConnectTooManyRequestsError as e:
-            logger.error(f"Too many requests while fetching activities: {e}")
+        except (GarminConnectConnectionError, GarminConnectTooManyRequestsError) as e:
+            logger.error("%s while fetching activities: %s", type(e).__name__, e)
             raise
         except Exception as e:
-            logger.error(f"An unexpected error occurred while fetching activities: {e}")
+            logger.error("An unexpected error occurred while fetching activities: %s", e)
             raise
 
     def download_activity_fit(self, activity_id: int, activity_data: Dict[str, Any], file_name: Optional[str] = None) -> Optional[str]:
@@ -115,36 +127,85 @@ class GarminConnectAPI:
             The path to the downloaded file, or None if the download failed.
         """
         try:
-            fit_data = self.client.download_activity(
-                activity_id, dl_fmt=self.client.ActivityDownloadFormat.FIT
-            )
+            client = self.client
+            fit_data = client.download_activity(activity_id, dl_fmt=self._fit_format)
             if not fit_data:
                 logger.warning(f"No FIT data received for activity ID {activity_id}.")
                 return None
 
             if not file_name:
                 file_name = f"activity_{activity_id}.fit"
+            # Write through a memoryview in 1 MiB chunks so large payloads
+            # are not copied wholesale into the file object's buffer.
+            chunk_size = 1 << 20
             with open(file_name, "wb") as f:
-                f.write(fit_data)
+                view = memoryview(fit_data)
+                for offset in range(0, len(view), chunk_size):
+                    f.write(view[offset:offset + chunk_size])
             logger.info(f"FIT file for activity {activity_id} saved as '{file_name}'")
             
-            self.metadata_store.store_activity_metadata(activity_data, file_name)
+            if self._batch_metadata:
+                self._pending_metadata.append((activity_data, file_name))
+            else:
+                self.metadata_store.store_activity_metadata(activity_data, file_name)
             return file_name
-        except GarminConnectConnectionError as e:
-            logger.error(f"Connection error while downloading FIT file for activity ID {activity_id}: {e}")
-            raise
-        except GarminConnectTooManyRequestsError as e:
-            logger.error(f"Too many requests while downloading FIT file for activity ID {activity_id}: {e}")
+        except (GarminConnectConnectionError, GarminConnectTooManyRequestsError) as e:
+            logger.error("%s while downloading FIT file for activity ID %s: %s", type(e).__name__, activity_id, e)
             raise
         except Exception as e:
-            logger.error(f"An unexpected error occurred while downloading FIT file for activity ID {activity_id}: {e}")
+            logger.error("An unexpected error occurred while downloading FIT file for activity ID %s: %s", activity_id, e)
             raise
 
+    def download_activities_fit(self, activities: List[Dict[str, Any]], max_workers: int = 8) -> Dict[int, Optional[str]]:
+        """
+        Downloads FIT files for several activities concurrently.
+
+        The downloads are network-bound, so they are overlapped with a
+        thread pool instead of running one at a time.
+
+        Args:
+            activities: Activity data dictionaries, as returned by
+                get_activities_by_date; each must contain an 'activityId'.
+            max_workers: Maximum number of concurrent downloads.
+
+        Returns:
+            A mapping of activity ID to the downloaded file path, or None
+            where no FIT data was available.
+        """
+        # Materialize the client before submitting work so the worker
+        # threads do not race each other through the login.
+        _ = self.client
+
+        results: Dict[int, Optional[str]] = {}
+        self._batch_metadata = True
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self.download_activity_fit, activity['activityId'], activity): activity['activityId']
+                    for activity in activities
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        finally:
+            self._batch_metadata = False
+            self.flush_metadata()
+        return results
+
+    def flush_metadata(self):
+        """Writes any buffered activity metadata in a single transaction."""
+        if not self._pending_metadata:
+            return
+        pending, self._pending_metadata = self._pending_metadata, []
+        self.metadata_store.store_activities_metadata(pending)
+        logger.info(f"Flushed metadata for {len(pending)} activities.")
+
     def logout(self):
         """Logs out from Garmin Connect."""
         if self._client and self._client.display_name:
             display_name = self._client.display_name
             self._client.logout()
             self._client = None
+            # Drop the cached_property value so the next access re-logs in.
+            self.__dict__.pop('client', None)
             logger.info(f"Logged out {display_name} from Garmin Connect.")
 
@@ -1,14 +1,90 @@
-from typing import Optional, Dict, Any, Iterator
+from __future__ import annotations
 
+from typing import Optional, Dict, Any
+
+import functools
+import io
+import mmap
 import pandas as pd
-from fitparse import FitFile, FitParseError
 import numpy as np
 import logging
 import os
 
+from fitanalysis._np_kernel import normalized_power_scalar
+
+
+def _ensure_fitparse() -> None:
+    """Imports fitparse into the module globals on first use."""
+    if 'FitFile' not in globals():
+        from fitparse import FitFile, FitParseError
+        globals()['FitFile'] = FitFile
+        globals()['FitParseError'] = FitParseError
+
+
+def __getattr__(name):
+    # fitparse is imported lazily (PEP 562) so that importing this module —
+    # e.g. for the exception types — doesn't pay the fitparse startup cost.
+    if name in ('FitFile', 'FitParseError'):
+        _ensure_fitparse()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+try:
+    from joblib import Parallel, delayed
+    HAS_JOBLIB = True
+except ImportError:
+    HAS_JOBLIB = False
+
+try:
+    # AOT-compiled record accumulation (built by setup.py when Cython is
+    # available); the pure-Python loop below is the fallback.
+    from fitanalysis._fitloader import parse_records as _parse_records_compiled
+    HAS_FITLOADER = True
+except ImportError:
+    HAS_FITLOADER = False
+
 logger = logging.getLogger(__name__)
 
 
+class _MmapStream:
+    """
+    Minimal read-only file-like over an mmap, carrying a ``name``.
+
+    fitparse wants a file-like with read/seek/tell; mapping the file lets
+    it pull bytes straight from the page cache instead of copying the
+    whole file into a Python buffer first.
+    """
+
+    __slots__ = ('_mm', 'name')
+
+    def __init__(self, mm: mmap.mmap, name: str) -> None:
+        self._mm = mm
+        self.name = name
+
+    def read(self, size: int = -1) -> bytes:
+        return self._mm.read(size)
+
+    def seek(self, pos: int, whence: int = 0) -> int:
+        self._mm.seek(pos, whence)
+        return self._mm.tell()
+
+    def tell(self) -> int:
+        return self._mm.tell()
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def _load_one(file_path: str):
+    """Loads a single FIT file; module-level so worker processes can pickle it."""
+    return file_path, FitDataLoader(file_path).data
+
+
+def _normalized_power_one(file_path: str):
+    """Computes NP for a single FIT file in a worker process."""
+    return file_path, FitDataLoader(file_path).get_normalized_power()
+
+
 class FitDataError(Exception):
     """Base exception for FIT data processing errors."""
     pass
@@ -34,6 +110,9 @@ class FitDataLoader:
     Loader for Garmin FIT files.
 
     This class provides methods to load, access, and analyze data from a FIT file.
+
+    For scalar lookups on the loaded DataFrame, prefer ``df.at[ts, col]``
+    over ``df.loc[ts, col]``: ``.at`` skips the generic indexing machinery.
     """
 
     def __init__(self, file_path: str) -> None:
@@ -45,15 +124,47 @@ class FitDataLoader:
         """
         self.file_path = file_path
         self._data: Optional[pd.DataFrame] = None
+        self._np_cache: Optional[float] = None
+        self._bytes: Optional[bytes] = None
 
-        if not os.path.exists(file_path):
-            raise FitFileNotFoundError(f"FIT file not found: {file_path}")
+        # A single stat both validates existence and yields the mtime/size
+        # used as the parse-cache key, avoiding a second syscall (and an
+        # exists/open race) in _load.
+        try:
+            self._stat = os.stat(file_path)
+        except OSError:
+            raise FitFileNotFoundError(f"FIT file not found: {file_path}") from None
 
         if not file_path.lower().endswith('.fit'):
             logger.warning(f"File {file_path} does not have a .fit extension")
 
         logger.info(f"FitDataLoader initialized for file: {file_path}")
 
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = '<memory>') -> "FitDataLoader":
+        """
+        Creates a loader over in-memory FIT bytes, with no file behind it.
+
+        Upload handlers that already hold the file contents can parse
+        them directly instead of round-tripping through a temp file on
+        disk.
+
+        Args:
+            data: The raw FIT file contents.
+            name: A label used in logs and error messages.
+
+        Returns:
+            A FitDataLoader parsing from the given bytes.
+        """
+        loader = cls.__new__(cls)
+        loader.file_path = name
+        loader._data = None
+        loader._np_cache = None
+        loader._bytes = data
+        loader._stat = None
+        logger.info(f"FitDataLoader initialized for in-memory data: {name}")
+        return loader
+
     @property
     def data(self) -> pd.DataFrame:
         """
@@ -68,27 +179,53 @@ class FitDataLoader:
             self._data = self._load()
         return self._data
 
+    def load(self) -> pd.DataFrame:
+        """
+        Loads and returns the FIT file data as a pandas DataFrame.
+
+        Method-call counterpart of the ``data`` property, sharing its
+        cache; this is the API the web upload handler uses.
+
+        Returns:
+            A pandas DataFrame containing the FIT file data.
+        """
+        return self.data
+
     def _load(self) -> pd.DataFrame:
         """Loads the FIT file and parses records into a DataFrame."""
         logger.info(f"Loading FIT file: {self.file_path}")
+        _ensure_fitparse()
 
-        try:
-            fit = FitFile(self.file_path)
-            records = list(self._get_records_generator(fit))
-            if not records:
-                return pd.DataFrame()
-            
-            df = pd.DataFrame.from_records(records)
-            if 'timestamp' in df.columns:
-                df.set_index('timestamp', inplace=True)
-
-            if df.empty:
-                logger.warning(f"No records found in FIT file: {self.file_path}")
-            else:
-                logger.info(f"Successfully loaded {len(df)} records from FIT file: {self.file_path}")
-
-            return df
+        # Opt-in persistent cache: a Parquet sidecar makes warm loads across
+        # processes a columnar read instead of a full fitparse pass.
+        use_sidecar = os.getenv('FITANALYSIS_CACHE') == '1'
+        sidecar = self.file_path + '.parquet'
 
+        try:
+            if self._bytes is not None:
+                stream = io.BytesIO(self._bytes)
+                stream.name = self.file_path
+                return self._parse_stream(stream, self.file_path)
+
+            stat = self._stat
+
+            if use_sidecar and os.path.exists(sidecar) and os.stat(sidecar).st_mtime >= stat.st_mtime:
+                logger.debug(f"Loading cached Parquet sidecar: {sidecar}")
+                return pd.read_parquet(sidecar)
+
+            df = self._parse_cached(self.file_path, stat.st_mtime_ns, stat.st_size)
+
+            if use_sidecar:
+                try:
+                    df.to_parquet(sidecar, compression='zstd', index=True)
+                except Exception as e:
+                    logger.debug(f"Could not write Parquet sidecar {sidecar}: {e}")
+
+            # Copy at the cache boundary: the memoized frame is shared by
+            # every loader of this file, and callers may freely mutate
+            # what .data hands them. A copy is cheap next to a fitparse
+            # pass (and lazy under pandas copy-on-write).
+            return df.copy()
         except FitParseError as e:
             error_msg = f"Error parsing FIT file {self.file_path}: {e}"
             logger.error(error_msg)
@@ -99,17 +236,98 @@ class FitDataLoader:
             raise FitDataError(error_msg) from e
 
     @staticmethod
-    def _get_records_generator(fit: FitFile) -> Iterator[Dict[str, Any]]:
-        """A generator that yields records from a FIT file."""
-        for record in fit.get_messages('record'):
-            rec = {'timestamp': record.get_value('timestamp')}
-            hr = record.get_value('heart_rate')
-            if hr is not None:
-                rec['heart_rate'] = hr
-            power = record.get_value('power')
-            if power is not None:
-                rec['power'] = power
-            yield rec
+    @functools.lru_cache(maxsize=64)
+    def _parse_cached(file_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+        """
+        Parses a FIT file into a DataFrame, memoized per process.
+
+        The mtime/size key means an unchanged file is parsed at most once
+        even across loader instances; editing the file invalidates the entry.
+        """
+        # Map the file instead of reading it into a Python buffer:
+        # fitparse pulls bytes zero-copy from the page cache, and the
+        # sequential-access hint triggers kernel readahead. Empty files
+        # cannot be mapped, so they fall back to an empty BytesIO.
+        if size:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            finally:
+                os.close(fd)
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            stream = _MmapStream(mm, file_path)
+        else:
+            stream = io.BytesIO(b'')
+            stream.name = file_path
+        return FitDataLoader._parse_stream(stream, file_path)
+
+    @staticmethod
+    def _parse_stream(stream, file_path: str) -> pd.DataFrame:
+        """Parses FIT records from an open stream into a DataFrame."""
+        fit = FitFile(stream)
+
+        # Accumulate column-wise in a single pass over the message stream:
+        # no generator indirection, no intermediate record list, and pandas
+        # gets ready-made arrays that skip per-row dtype inference. Records
+        # carrying neither heart rate nor power are skipped rather than
+        # producing all-missing rows.
+        try:
+            if HAS_FITLOADER:
+                timestamps, heart_rates, powers = _parse_records_compiled(fit)
+            else:
+                timestamps = []
+                heart_rates = []
+                powers = []
+                for record in fit.get_messages('record'):
+                    # get_values() walks the message fields once; three
+                    # separate get_value() calls would each rescan the
+                    # field list.
+                    values = record.get_values()
+                    hr = values.get('heart_rate')
+                    power = values.get('power')
+                    if hr is None and power is None:
+                        continue
+                    timestamps.append(values.get('timestamp'))
+                    heart_rates.append(hr)
+                    powers.append(power)
+        finally:
+            stream.close()
+
+        if not timestamps:
+            logger.warning(f"No records found in FIT file: {file_path}")
+            return pd.DataFrame()
+
+        # Quantized nullable integers instead of float64: heart rate is a
+        # byte (0-255) and power fits in uint16, shrinking the columns 8x
+        # and 4x while still representing missing samples (as pd.NA).
+        columns = {}
+        if any(v is not None for v in heart_rates):
+            columns['heart_rate'] = pd.array(heart_rates, dtype='UInt8')
+        if any(v is not None for v in powers):
+            columns['power'] = pd.array(powers, dtype='UInt16')
+
+        # FIT files record timestamps in monotonic order, so the index is
+        # used as-is with no sort; the check below only runs when debugging.
+        index = pd.DatetimeIndex(timestamps, name='timestamp')
+        if logger.isEnabledFor(logging.DEBUG) and not index.is_monotonic_increasing:
+            logger.debug(f"Timestamps in {file_path} are not monotonically increasing")
+
+        df = pd.DataFrame(columns, index=index)
+        logger.info(f"Successfully loaded {len(df)} records from FIT file: {file_path}")
+        return df
+
+    def refresh(self) -> None:
+        """Clears cached data and metrics so the next access reloads them."""
+        self._data = None
+        self._np_cache = None
+        if self._bytes is not None:
+            return
+        # Re-stat so a file modified since __init__ gets a fresh cache key.
+        try:
+            self._stat = os.stat(self.file_path)
+        except OSError:
+            raise FitFileNotFoundError(f"FIT file not found: {self.file_path}") from None
 
     def get_heart_rate(self) -> pd.Series:
         """
@@ -138,22 +356,29 @@ class FitDataLoader:
         Returns:
             The Normalized Power value.
         """
+        if self._np_cache is not None:
+            return self._np_cache
+
         power_series = self.get_power()
         if power_series.empty:
             return 0.0
 
-        power_numeric = pd.to_numeric(power_series, errors='coerce').dropna()
+        # The loader already produces numeric power columns; the coercion
+        # scan is only needed for object-dtype input from elsewhere.
+        if power_series.dtype.kind in 'fiu':
+            power_numeric = power_series.dropna()
+        else:
+            power_numeric = pd.to_numeric(power_series, errors='coerce').dropna()
 
         if power_numeric.empty:
             return 0.0
 
-        rolling_avg_power_4 = power_numeric.pow(4).rolling(window='30s', min_periods=1).mean()
-
-        if not rolling_avg_power_4.empty:
-            np_value = np.power(rolling_avg_power_4.mean(), 0.25)
-            return np_value
-        else:
-            return 0.0
+        # FIT records are sampled at 1 Hz, so the 30 s window is a fixed
+        # 30-sample window handled by the kernel module (numba-fused when
+        # available, cumulative-sum otherwise).
+        arr = np.ascontiguousarray(power_numeric.to_numpy(dtype=np.float64))
+        self._np_cache = normalized_power_scalar(arr)
+        return self._np_cache
 
     def get_intensity_factor(self, ftp: float) -> float:
         """
@@ -193,15 +418,73 @@ class FitDataLoader:
         if power_series.empty:
             return 0.0
 
-        duration_seconds = (power_series.index[-1] - power_series.index[0]).total_seconds()
-        if_value = self.get_intensity_factor(ftp)
+        # NP is computed once; with IF = NP/FTP substituted in, the formula
+        # collapses to duration * NP^2 * 100 / (FTP^2 * 3600) — one division
+        # instead of two and no get_intensity_factor call.
         np_value = self.get_normalized_power()
-
-        if np_value == 0.0 or if_value == 0.0:
+        if np_value == 0.0:
             return 0.0
 
-        tss = (duration_seconds * np_value * if_value) / (ftp * 3600) * 100
-        return tss
+        # Subtracting the raw datetime64 values avoids allocating a pandas
+        # Timedelta object; the division is unit-safe whatever resolution
+        # the index carries.
+        ts = power_series.index.values
+        duration_seconds = float((ts[-1] - ts[0]) / np.timedelta64(1, 's'))
+        return duration_seconds * np_value * np_value * 100.0 / (ftp * ftp * 3600.0)
+
+    @staticmethod
+    def _run_parallel(func, paths, n_jobs: int):
+        """Maps func over paths with joblib, or a process pool without it."""
+        paths = list(paths)
+        if n_jobs == 1:
+            # Serial in-process: no worker spawn or pickling overhead for
+            # small batches.
+            return [func(path) for path in paths]
+        if HAS_JOBLIB:
+            # Chunked dispatch is what makes the fan-out pay off; per-file
+            # tasks are too small to amortize worker round trips.
+            return Parallel(n_jobs=n_jobs, backend='loky', batch_size=50)(
+                delayed(func)(path) for path in paths
+            )
+        from concurrent.futures import ProcessPoolExecutor
+        max_workers = None if n_jobs == -1 else n_jobs
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(func, paths, chunksize=50))
+
+    @staticmethod
+    def load_many(paths, n_jobs: int = -1) -> Dict[str, pd.DataFrame]:
+        """
+        Loads many FIT files in parallel across processes.
+
+        fitparse holds the GIL, so threads do not help; independent files
+        parse in worker processes instead.
+
+        Args:
+            paths: Paths to the FIT files.
+            n_jobs: Number of worker processes (-1 uses all cores).
+
+        Returns:
+            A dict mapping each path to its loaded DataFrame.
+        """
+        return dict(FitDataLoader._run_parallel(_load_one, paths, n_jobs))
+
+    @staticmethod
+    def normalized_power_many(paths, n_jobs: int = -1) -> pd.Series:
+        """
+        Calculates Normalized Power for many FIT files in parallel.
+
+        Args:
+            paths: Paths to the FIT files.
+            n_jobs: Number of worker processes (-1 uses all cores).
+
+        Returns:
+            A pandas Series of NP values indexed by file path.
+        """
+        results = FitDataLoader._run_parallel(_normalized_power_one, paths, n_jobs)
+        if not results:
+            return pd.Series(dtype='float64')
+        file_paths, np_values = zip(*results)
+        return pd.Series(np_values, index=list(file_paths), dtype='float64')
 
     @staticmethod
     def max_power_by_time(file_path: str) -> pd.DataFrame:
@@ -214,16 +497,30 @@ class FitDataLoader:
         Returns:
             A DataFrame with the maximum power for each time step.
         """
+        _ensure_fitparse()
         fitfile = FitFile(file_path)
-        records = []
+        timestamps = []
+        powers = []
         for record in fitfile.get_messages('record'):
-            records.append({
-                'timestamp': record.get_value('timestamp'),
-                'power': record.get_value('power')
-            })
-        df = pd.DataFrame(records)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.set_index('timestamp')
-        max_power = df.groupby(df.index.time)['power'].max()
-        return max_power
+            values = record.get_values()
+            timestamps.append(values.get('timestamp'))
+            powers.append(values.get('power'))
+
+        if not timestamps:
+            return pd.Series(dtype='float64', name='power')
+
+        # Grouping on df.index.time would allocate a datetime.time object
+        # per row and hash-group on it in Python. Instead bin by integer
+        # second-of-day and scatter-max into a fixed 86400-slot array.
+        index = pd.DatetimeIndex(timestamps)
+        seconds_of_day = (index.hour * 3600 + index.minute * 60 + index.second).to_numpy(dtype=np.int64)
+        power = np.array([np.nan if v is None else v for v in powers], dtype=np.float64)
+
+        bins = np.full(86400, -np.inf)
+        mask = ~np.isnan(power)
+        np.maximum.at(bins, seconds_of_day[mask], power[mask])
+
+        valid = np.isfinite(bins)
+        times = pd.to_datetime(np.flatnonzero(valid), unit='s').time
+        return pd.Series(bins[valid], index=times, name='power')
 
@@ -1,11 +1,69 @@
-import duckdb
+from __future__ import annotations
+
 import pandas as pd
 import os
 import logging
-from typing import Optional, Dict, Any
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import duckdb
+
+from fitanalysis.db_pool import close_all_pools, get_pool
 
 logger = logging.getLogger(__name__)
 
+# Column order of the activities table; also the staging-table layout for
+# bulk inserts and the whitelist for column projections.
+_ACTIVITY_COLUMNS = (
+    'activity_id', 'activity_name', 'activity_type',
+    'start_time_gmt', 'start_time_local', 'distance', 'duration',
+    'calories', 'average_hr', 'max_hr', 'average_power',
+    'max_power', 'file_path'
+)
+
+# Statement texts are built once at import; handing DuckDB the same string
+# object on every call keeps the per-call work to bind + execute instead of
+# re-assembling SQL per activity. (The Python client exposes no explicit
+# prepare() API; this is the closest it gets to a prepared statement.)
+_INSERT_ACTIVITY_SQL = """
+    INSERT INTO activities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (activity_id) DO NOTHING
+    RETURNING activity_id
+"""
+
+_BULK_INSERT_SQL = """
+    INSERT INTO activities
+    SELECT * FROM staged_activities
+    ON CONFLICT (activity_id) DO NOTHING
+"""
+
+_BULK_INSERT_NEW_SQL = """
+    INSERT INTO activities
+    SELECT * FROM staged_activities
+"""
+
+# Process-wide connection registry. Opening a DuckDB database acquires a
+# file lock and replays the WAL, so short-lived stores (one per download or
+# upload request) should share one connection per path rather than paying
+# that cost every time. DuckDB allows one writer per database, so writes on
+# a shared connection are serialized through the per-path lock. Each entry
+# records the mode the connection was opened in, so attaching stores (and
+# the read pool) can match it.
+_CONNECTIONS: Dict[str, Tuple["duckdb.DuckDBPyConnection", bool]] = {}
+_INITIALIZED_PATHS = set()
+# Reentrant so the store methods can take the lock inside an open
+# transaction() block, which holds it for the whole batch.
+_WRITE_LOCKS: Dict[str, threading.RLock] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+# Advisory per-path cache of stored activity_ids, loaded once per process.
+# It turns dedup into an O(1) set lookup with no SQL round-trip; the
+# ON CONFLICT clause on the inserts remains the correctness backstop for
+# ids written by other processes.
+_KNOWN_IDS: Dict[str, set] = {}
+
 
 class MetadataStoreError(Exception):
     """Base exception for metadata store errors."""
@@ -25,25 +83,78 @@ class MetadataStore:
     """
     A class to store and retrieve activity metadata from a DuckDB database.
 
-    This class can be used as a context manager to ensure that the database
-    connection is properly closed.
+    This class can be used as a context manager. Instances attach to a
+    process-wide connection shared per database path; exiting the context
+    detaches the instance, while MetadataStore.shutdown() closes the
+    underlying handles.
     """
-    def __init__(self, db_path: str = 'fit_metadata.db'):
+    def __init__(self, db_path: str = 'fit_metadata.db', read_only: bool = False):
         """
         Initializes the MetadataStore.
 
         Args:
             db_path: The path to the DuckDB database file.
+            read_only: Open the database read-only. DuckDB allows any
+                number of concurrent read-only processes on a file (but
+                only one writer), so dashboards that never ingest should
+                use this — or the reader() classmethod — to avoid taking
+                the writer slot.
         """
         self.db_path = db_path
+        self.read_only = read_only
         self.conn: Optional[duckdb.DuckDBPyConnection] = None
+        self._write_lock: Optional[threading.RLock] = None
+        self._known_ids: Optional[set] = None
+        # Mode of the shared connection actually attached to; pooled read
+        # connections must match it, since DuckDB rejects opening the same
+        # file with a different configuration in one process.
+        self._conn_read_only: Optional[bool] = None
+
+    @classmethod
+    def reader(cls, db_path: str = 'fit_metadata.db') -> "MetadataStore":
+        """The canonical read-only store for analytics-style workloads."""
+        return cls(db_path, read_only=True)
 
     def __enter__(self) -> "MetadataStore":
-        """Opens the database connection."""
+        """Attaches to the shared database connection for this path."""
         try:
-            self.conn = duckdb.connect(database=self.db_path, read_only=False)
-            logger.info(f"Connected to database: {self.db_path}")
-            self._create_table()
+            with _REGISTRY_LOCK:
+                entry = _CONNECTIONS.get(self.db_path)
+                if entry is None:
+                    # Deferred import: duckdb costs a noticeable chunk of
+                    # startup time and is only needed once a connection is
+                    # actually opened.
+                    import duckdb
+                    conn = duckdb.connect(database=self.db_path, read_only=self.read_only)
+                    if not self.read_only:
+                        self._apply_pragmas(conn)
+                    _CONNECTIONS[self.db_path] = (conn, self.read_only)
+                    _WRITE_LOCKS[self.db_path] = threading.RLock()
+                    self._conn_read_only = self.read_only
+                    logger.info(f"Connected to database: {self.db_path}")
+                else:
+                    # Reads work fine on a shared read-write handle, but a
+                    # writer cannot piggyback on a read-only one.
+                    conn, cached_read_only = entry
+                    if cached_read_only and not self.read_only:
+                        raise DatabaseConnectionError(
+                            f"Database {self.db_path} is already open read-only in this process"
+                        )
+                    self._conn_read_only = cached_read_only
+                self.conn = conn
+                self._write_lock = _WRITE_LOCKS[self.db_path]
+            if not self.read_only and self.db_path not in _INITIALIZED_PATHS:
+                self._create_table()
+                _INITIALIZED_PATHS.add(self.db_path)
+            # Readers never consult the dedup cache, and a read-only
+            # database may not even have the table yet.
+            if not self.read_only:
+                if self.db_path not in _KNOWN_IDS:
+                    _KNOWN_IDS[self.db_path] = {
+                        row[0] for row in
+                        self.conn.execute("SELECT activity_id FROM activities").fetchall()
+                    }
+                self._known_ids = _KNOWN_IDS[self.db_path]
             return self
         except Exception as e:
             error_msg = f"Failed to connect to database {self.db_path}: {e}"
@@ -54,6 +165,22 @@ class MetadataStore:
         """Closes the database connection."""
         self.close()
 
+    def _apply_pragmas(self, conn):
+        """
+        Apply configured session settings to a fresh connection.
+
+        Defaults (see DatabaseConfig) disable preserve_insertion_order —
+        queries always go through filters or sorts, never physical row
+        order — and raise the checkpoint threshold so bulk syncs are not
+        stalled by WAL checkpoints.
+        """
+        from fitanalysis.config import get_config
+        for name, value in get_config().database.pragmas.items():
+            try:
+                conn.execute(f"SET {name} = {value!r}")
+            except Exception as e:
+                logger.warning(f"Could not set DuckDB option {name}={value!r}: {e}")
+
     def _create_table(self):
         """Create the activities table if it doesn't exist."""
         try:
@@ -84,29 +211,64 @@ class MetadataStore:
             logger.error(error_msg)
             raise DatabaseOperationError(error_msg) from e
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one explicit transaction.
+
+        Each store call otherwise auto-commits, paying the per-commit
+        overhead for every row; wrapping a loop of writes in this block
+        amortizes it to a single COMMIT. The write lock is held for the
+        whole block, so other threads cannot interleave writes into the
+        open transaction. Rolls back on exception and reloads the dedup
+        cache, since rolled-back ids must not be treated as stored.
+        """
+        if self.conn is None:
+            raise DatabaseConnectionError("Database connection is not available")
+        if self.read_only:
+            raise DatabaseOperationError("Metadata store is open read-only")
+
+        with self._write_lock:
+            self.conn.execute("BEGIN TRANSACTION")
+            try:
+                yield self
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                self._known_ids.clear()
+                self._known_ids.update(
+                    row[0] for row in
+                    self.conn.execute("SELECT activity_id FROM activities").fetchall()
+                )
+                raise
+            else:
+                self.conn.execute("COMMIT")
+
     def store_activity_metadata(self, activity_data: Dict[str, Any], file_path: str):
         """Store activity metadata in the database."""
         try:
             if self.conn is None:
                 raise DatabaseConnectionError("Database connection is not available")
-                
+            if self.read_only:
+                raise DatabaseOperationError("Metadata store is open read-only")
+
             activity_id = str(activity_data.get('activityId'))
             if not activity_id or activity_id == 'None':
                 raise DatabaseOperationError("Activity ID is required and cannot be None")
-            
-            with self.conn.cursor() as cursor:
-                result = cursor.execute(
-                    "SELECT activity_id FROM activities WHERE activity_id = ?", 
-                    (activity_id,)
-                ).fetchone()
-                
-                if result:
-                    logger.info(f"Activity {activity_id} already exists in metadata store. Skipping.")
-                    return
 
-                cursor.execute("""
-                    INSERT INTO activities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+            # O(1) advisory dedup: ids this process has already seen skip
+            # the database entirely.
+            if activity_id in self._known_ids:
+                logger.info(f"Activity {activity_id} already exists in metadata store. Skipping.")
+                return
+
+            # A single upsert replaces the old existence SELECT + INSERT
+            # pair: the primary-key index resolves the conflict, and
+            # RETURNING tells us whether the row actually went in. This
+            # executes on the shared connection, not a cursor — cursors
+            # are separate DuckDB connections with their own transaction
+            # state and would commit outside a transaction() block.
+            with self._write_lock:
+                inserted = self.conn.execute(_INSERT_ACTIVITY_SQL, (
                     activity_id,
                     activity_data.get('activityName'),
                     activity_data.get('activityType'),
@@ -120,9 +282,14 @@ class MetadataStore:
                     activity_data.get('averagePower'),
                     activity_data.get('maxPower'),
                     file_path
-                ))
+                )).fetchone()
+
+            self._known_ids.add(activity_id)
+            if inserted is None:
+                logger.info(f"Activity {activity_id} already exists in metadata store. Skipping.")
+                return
             logger.info(f"Stored metadata for activity {activity_id} in {self.db_path}")
-            
+
         except DatabaseConnectionError:
             raise
         except Exception as e:
@@ -130,29 +297,344 @@ class MetadataStore:
             logger.error(error_msg)
             raise DatabaseOperationError(error_msg) from e
 
-    def get_all_activities(self) -> pd.DataFrame:
-        """Retrieve all activities from the database."""
+    def store_activities_metadata(self, items):
+        """
+        Store metadata for several activities in a single bulk insert.
+
+        The batch is staged as an Arrow table registered with DuckDB —
+        which scans it zero-copy — and written with one INSERT ... SELECT
+        whose ON CONFLICT clause drops already-present activity_ids via
+        the primary-key index. One statement and one commit, instead of
+        an existence SELECT plus INSERT per activity.
+
+        Args:
+            items: An iterable of (activity_data, file_path) pairs.
+        """
         try:
             if self.conn is None:
                 raise DatabaseConnectionError("Database connection is not available")
-            
-            with self.conn.cursor() as cursor:
-                result = cursor.execute("SELECT * FROM activities").fetchdf()
+            if self.read_only:
+                raise DatabaseOperationError("Metadata store is open read-only")
+
+            rows = []
+            seen = set()
+            for activity_data, file_path in items:
+                activity_id = str(activity_data.get('activityId'))
+                if not activity_id or activity_id == 'None':
+                    raise DatabaseOperationError("Activity ID is required and cannot be None")
+                if activity_id in self._known_ids:
+                    continue
+                if activity_id in seen:
+                    logger.info(f"Activity {activity_id} duplicated in batch. Skipping.")
+                    continue
+                seen.add(activity_id)
+                rows.append((
+                    activity_id,
+                    activity_data.get('activityName'),
+                    activity_data.get('activityType'),
+                    activity_data.get('startTimeGMT'),
+                    activity_data.get('startTimeLocal'),
+                    activity_data.get('distance'),
+                    activity_data.get('duration'),
+                    activity_data.get('calories'),
+                    activity_data.get('averageHR'),
+                    activity_data.get('maxHR'),
+                    activity_data.get('averagePower'),
+                    activity_data.get('maxPower'),
+                    file_path
+                ))
+
+            if not rows:
+                return
+
+            import pyarrow as pa
+            staged = pa.table(dict(zip(_ACTIVITY_COLUMNS, zip(*rows))))
+
+            with self._write_lock:
+                self.conn.register('staged_activities', staged)
+                try:
+                    self.conn.execute(_BULK_INSERT_SQL)
+                finally:
+                    self.conn.unregister('staged_activities')
+            self._known_ids.update(seen)
+            logger.info(f"Stored metadata for {len(rows)} activities in {self.db_path}")
+
+        except (DatabaseConnectionError, DatabaseOperationError):
+            raise
+        except Exception as e:
+            error_msg = f"Failed to store metadata batch in {self.db_path}: {e}"
+            logger.error(error_msg)
+            raise DatabaseOperationError(error_msg) from e
+
+    def bulk_insert_new(self, items):
+        """
+        Insert activities the caller guarantees are not yet stored.
+
+        Skipping the ON CONFLICT clause lets DuckDB stream the staged
+        Arrow table straight into the column buffers with no per-row
+        conflict probe — the fastest ingest path for first-time syncs.
+        Callers should dedup against the known-id cache first; a
+        duplicate here surfaces as a primary-key violation wrapped in
+        DatabaseOperationError, and the whole batch is rolled back —
+        no rows from it are written and none of its ids are cached.
+
+        Args:
+            items: An iterable of (activity_data, file_path) pairs.
+        """
+        try:
+            if self.conn is None:
+                raise DatabaseConnectionError("Database connection is not available")
+            if self.read_only:
+                raise DatabaseOperationError("Metadata store is open read-only")
+
+            rows = []
+            ids = set()
+            for activity_data, file_path in items:
+                activity_id = str(activity_data.get('activityId'))
+                if not activity_id or activity_id == 'None':
+                    raise DatabaseOperationError("Activity ID is required and cannot be None")
+                ids.add(activity_id)
+                rows.append((
+                    activity_id,
+                    activity_data.get('activityName'),
+                    activity_data.get('activityType'),
+                    activity_data.get('startTimeGMT'),
+                    activity_data.get('startTimeLocal'),
+                    activity_data.get('distance'),
+                    activity_data.get('duration'),
+                    activity_data.get('calories'),
+                    activity_data.get('averageHR'),
+                    activity_data.get('maxHR'),
+                    activity_data.get('averagePower'),
+                    activity_data.get('maxPower'),
+                    file_path
+                ))
+
+            if not rows:
+                return
+
+            import pyarrow as pa
+            staged = pa.table(dict(zip(_ACTIVITY_COLUMNS, zip(*rows))))
+
+            with self._write_lock:
+                self.conn.register('staged_activities', staged)
+                try:
+                    self.conn.execute(_BULK_INSERT_NEW_SQL)
+                finally:
+                    self.conn.unregister('staged_activities')
+            self._known_ids.update(ids)
+            logger.info(f"Stored metadata for {len(rows)} activities in {self.db_path}")
+
+        except (DatabaseConnectionError, DatabaseOperationError):
+            raise
+        except Exception as e:
+            error_msg = f"Failed to store metadata batch in {self.db_path}: {e}"
+            logger.error(error_msg)
+            raise DatabaseOperationError(error_msg) from e
+
+    @contextmanager
+    def _read_conn(self):
+        """
+        Yields a connection suitable for read queries.
+
+        On-disk databases read through the bounded pool so concurrent
+        callers each get their own handle; in-memory databases have no
+        path to reopen (a pooled connect to ':memory:' would create a
+        separate, empty database), so reads cursor off the shared handle.
+        """
+        if self.db_path == ':memory:':
+            with self.conn.cursor() as conn:
+                yield conn
+        else:
+            # The pool must open its connections in the same mode as the
+            # shared handle — a read-write pool against a read-only store
+            # (or vice versa) is a configuration mismatch DuckDB refuses.
+            with get_pool(self.db_path, read_only=self._conn_read_only).acquire() as conn:
+                yield conn
+
+    def get_all_activities_arrow(self):
+        """
+        Retrieve all activities as a pyarrow Table.
+
+        DuckDB hands its result over to Arrow without building pandas
+        blocks, so callers that only iterate rows or re-serialize skip
+        the DataFrame conversion entirely.
+
+        Returns:
+            A pyarrow.Table of the activities table.
+        """
+        try:
+            if self.conn is None:
+                raise DatabaseConnectionError("Database connection is not available")
+
+            with self._read_conn() as conn:
+                result = conn.execute("SELECT * FROM activities").to_arrow_table()
             logger.debug(f"Retrieved {len(result)} activities from {self.db_path}")
             return result
-            
+
         except Exception as e:
             error_msg = f"Failed to retrieve activities from {self.db_path}: {e}"
             logger.error(error_msg)
             raise DatabaseOperationError(error_msg) from e
 
-    def close(self):
-        """Close the database connection."""
+    def get_all_activities_polars(self):
+        """
+        Retrieve all activities as a polars DataFrame.
+
+        Built on the Arrow result, so the handover is zero-copy; callers
+        can chain .lazy() to fuse filters and projections into one
+        parallel query instead of materializing pandas intermediates.
+        Requires the optional polars dependency (the 'perf' extra).
+
+        Returns:
+            A polars.DataFrame of the activities table.
+        """
+        import polars as pl  # deferred: optional perf dependency
+        return pl.from_arrow(self.get_all_activities_arrow())
+
+    def get_all_activities(self) -> pd.DataFrame:
+        """Retrieve all activities from the database as a DataFrame."""
+        return self.get_all_activities_arrow().to_pandas()
+
+    def get_activities(self, columns=None) -> pd.DataFrame:
+        """
+        Retrieve activities, optionally projected to selected columns.
+
+        Scan cost in DuckDB is rows x column width, so callers that only
+        need a few metrics should name them rather than pulling all 13
+        columns through SELECT *.
+
+        Args:
+            columns: Column names to select; None selects everything.
+
+        Returns:
+            A pandas DataFrame with the requested columns.
+        """
+        if not columns:
+            return self.get_all_activities()
+
+        invalid = set(columns) - set(_ACTIVITY_COLUMNS)
+        if invalid:
+            raise DatabaseOperationError(f"Unknown activity columns: {sorted(invalid)}")
+
         try:
-            if self.conn is not None:
-                self.conn.close()
-                self.conn = None
-                logger.info(f"Database connection to {self.db_path} closed")
+            if self.conn is None:
+                raise DatabaseConnectionError("Database connection is not available")
+
+            with self._read_conn() as conn:
+                result = conn.execute(
+                    f"SELECT {', '.join(columns)} FROM activities"
+                ).to_arrow_table()
+            logger.debug(f"Retrieved {len(result)} activities from {self.db_path}")
+            return result.to_pandas()
+
+        except (DatabaseConnectionError, DatabaseOperationError):
+            raise
         except Exception as e:
-            logger.warning(f"Error closing database connection to {self.db_path}: {e}")
+            error_msg = f"Failed to retrieve activities from {self.db_path}: {e}"
+            logger.error(error_msg)
+            raise DatabaseOperationError(error_msg) from e
+
+    def column_names(self) -> tuple:
+        """
+        Return the activities table's column names from the live schema.
+
+        A PRAGMA lookup costs no Arrow or DataFrame allocation, unlike
+        materializing a result set just to read its columns.
+
+        Returns:
+            A tuple of column names in table order.
+        """
+        try:
+            if self.conn is None:
+                raise DatabaseConnectionError("Database connection is not available")
+            with self._read_conn() as conn:
+                return tuple(
+                    row[1] for row in
+                    conn.execute("PRAGMA table_info('activities')").fetchall()
+                )
+        except DatabaseConnectionError:
+            raise
+        except Exception as e:
+            error_msg = f"Failed to read activities schema in {self.db_path}: {e}"
+            logger.error(error_msg)
+            raise DatabaseOperationError(error_msg) from e
+
+    def count_activities(self) -> int:
+        """
+        Count stored activities without materializing a DataFrame.
+
+        Returns:
+            The number of rows in the activities table.
+        """
+        try:
+            if self.conn is None:
+                raise DatabaseConnectionError("Database connection is not available")
+            with self._read_conn() as conn:
+                return conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0]
+        except DatabaseConnectionError:
+            raise
+        except Exception as e:
+            error_msg = f"Failed to count activities in {self.db_path}: {e}"
+            logger.error(error_msg)
+            raise DatabaseOperationError(error_msg) from e
+
+    def sum_column(self, column: str) -> Optional[float]:
+        """
+        Sum one numeric column inside DuckDB.
+
+        A SELECT SUM(col) returns a single scalar; pulling the column
+        into pandas just to sum it would copy every row first.
+
+        Args:
+            column: The activity column to aggregate.
+
+        Returns:
+            The column sum, or None for an empty table.
+        """
+        if column not in _ACTIVITY_COLUMNS:
+            raise DatabaseOperationError(f"Unknown activity column: {column!r}")
+        try:
+            if self.conn is None:
+                raise DatabaseConnectionError("Database connection is not available")
+            with self._read_conn() as conn:
+                return conn.execute(f"SELECT SUM({column}) FROM activities").fetchone()[0]
+        except (DatabaseConnectionError, DatabaseOperationError):
+            raise
+        except Exception as e:
+            error_msg = f"Failed to aggregate {column} in {self.db_path}: {e}"
+            logger.error(error_msg)
+            raise DatabaseOperationError(error_msg) from e
+
+    def close(self):
+        """
+        Detach this store from the shared connection.
+
+        The underlying DuckDB connection stays open in the process-wide
+        registry so the next store on the same path skips the file-lock
+        and WAL-replay cost; use shutdown() to actually close handles.
+        """
+        if self.conn is not None:
+            self.conn = None
+            self._write_lock = None
+            self._known_ids = None
+            self._conn_read_only = None
+            logger.info(f"Database connection to {self.db_path} closed")
+
+    @classmethod
+    def shutdown(cls):
+        """Close all shared connections; intended for process teardown."""
+        with _REGISTRY_LOCK:
+            for db_path, (conn, _) in _CONNECTIONS.items():
+                try:
+                    conn.close()
+                except Exception as e:
+                    logger.warning(f"Error closing database connection to {db_path}: {e}")
+            _CONNECTIONS.clear()
+            _WRITE_LOCKS.clear()
+            _INITIALIZED_PATHS.clear()
+            _KNOWN_IDS.clear()
+        # Pooled read handles hold the database files open too; leaving
+        # them would block reopening a path in a different mode.
+        close_all_pools()
 
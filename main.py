@@ -1,9 +1,13 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import Response
 import pandas as pd
 from fitanalysis.loader import FitDataLoader
 from fitanalysis.config import get_config, setup_logging
+import asyncio
+import hashlib
 import io
+import logging
+import stat
 import tempfile
 import os
 
@@ -11,56 +15,179 @@ import os
 config = get_config()
 setup_logging(config)
 
+logger = logging.getLogger(__name__)
+
+# Opt-in upload cache, sharing the FITANALYSIS_CACHE switch with the
+# loader's Parquet sidecar: parsed DataFrames are cached by upload content
+# hash so re-uploading the same file skips the FIT parse entirely.
+_UPLOAD_CACHE_ENABLED = os.getenv('FITANALYSIS_CACHE') == '1'
+
+
+def _upload_cache_dir():
+    """
+    Resolve the upload cache directory, or None if it cannot be trusted.
+
+    Cached entries are served back verbatim, so the directory must not be
+    writable by other users — a world-writable cache in the shared temp
+    dir would let another local user plant {sha256}.parquet files. The
+    path embeds the uid, the directory is created mode 0o700, and
+    ownership and permissions are re-checked on every resolve; any
+    mismatch disables the cache for the request rather than trusting it.
+    """
+    base = config.web.temp_dir or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    path = os.path.join(base, f'fitanalysis_upload_cache_{uid}')
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+    except OSError as e:
+        logger.warning(f"Upload cache disabled: cannot create {path}: {e}")
+        return None
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != uid
+        or info.st_mode & 0o077
+    ):
+        logger.warning(f"Upload cache disabled: {path} is not a private directory owned by this user")
+        return None
+    return path
+
+# Uploads up to this size are parsed straight from memory; only larger
+# files take the tempfile round-trip (where the loader's mmap path pays
+# off anyway).
+_IN_MEMORY_UPLOAD_LIMIT = 32 << 20
+
 app = FastAPI()
 
+def _dataframe_response(df: pd.DataFrame, format: str):
+    """
+    Serialize an analysis DataFrame for transport.
+
+    JSON stays the default for compatibility; format=arrow returns Arrow
+    IPC bytes, which encode columns in one memcpy-style pass instead of
+    rendering every float as a decimal string. float64 columns are
+    downcast to float32 first — power and heart rate never need the
+    precision, and it halves the payload.
+    """
+    if format == 'arrow':
+        float_cols = df.select_dtypes('float64').columns
+        if len(float_cols):
+            df = df.astype({col: 'float32' for col in float_cols})
+        buf = io.BytesIO()
+        df.reset_index().to_feather(buf)
+        return Response(content=buf.getvalue(), media_type='application/vnd.apache.arrow.file')
+    # Hand pandas' C-serialized JSON straight to the client. Returning the
+    # string would make FastAPI JSON-encode it a second time, doubling the
+    # serialization work and wrapping the payload in an escaped string.
+    return Response(content=df.to_json(orient='split'), media_type='application/json')
+
+
 @app.post("/upload/")
-async def upload_fit_file(file: UploadFile = File(...)):
+async def upload_fit_file(file: UploadFile = File(...), format: str = 'json'):
     # Check file extension against configured allowed extensions
     if not any(file.filename.endswith(ext) for ext in config.web.allowed_extensions):
         raise HTTPException(
-            status_code=400, 
+            status_code=400,
             detail=f"Invalid file type. Please upload a file with one of these extensions: {', '.join(config.web.allowed_extensions)}"
         )
-    
-    # Check file size
-    if file.size and file.size > config.web.max_file_size:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Maximum size is {config.web.max_file_size} bytes."
-        )
-    
+
+    if format not in ('json', 'arrow'):
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
     try:
-        # Use an in-memory file
-        content = await file.read()
-        
-        # Create a temporary file with proper cross-platform handling
+        # Stream the upload in 1 MiB chunks, buffering in memory and only
+        # spilling to a tempfile once the size passes the in-memory limit.
+        # The size limit is enforced on actual bytes received rather than
+        # the client-declared Content-Length.
         temp_dir = config.web.temp_dir
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.fit', dir=temp_dir) as temp_file:
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
+        total_bytes = 0
+        # Hashing rides along with the chunk loop, so the content digest
+        # costs no extra pass over the file.
+        hasher = hashlib.sha256() if _UPLOAD_CACHE_ENABLED else None
+        chunks = []
+        temp_file = None
+        temp_file_path = None
+        # The streaming loop sits inside the cleanup try: a client abort
+        # mid-upload raises out of file.read(), and the spilled tempfile
+        # must be unlinked on that path just like after a parse.
         try:
-            loader = FitDataLoader(temp_file_path)
-            df = loader.load()
-            
-            # Convert DataFrame to JSON
-            return df.to_json(orient='split')
+            while chunk := await file.read(1 << 20):
+                total_bytes += len(chunk)
+                if total_bytes > config.web.max_file_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {config.web.max_file_size} bytes."
+                    )
+                if hasher is not None:
+                    hasher.update(chunk)
+                if temp_file is None and total_bytes > _IN_MEMORY_UPLOAD_LIMIT:
+                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.fit', dir=temp_dir)
+                    temp_file_path = temp_file.name
+                    for buffered in chunks:
+                        temp_file.write(buffered)
+                    chunks = []
+                if temp_file is not None:
+                    temp_file.write(chunk)
+                else:
+                    chunks.append(chunk)
+            if temp_file is not None:
+                temp_file.close()
+
+            cache_path = None
+            if hasher is not None:
+                cache_dir = _upload_cache_dir()
+                if cache_dir is not None:
+                    cache_path = os.path.join(cache_dir, hasher.hexdigest() + '.parquet')
+                if cache_path is not None and os.path.exists(cache_path):
+                    df = await asyncio.to_thread(pd.read_parquet, cache_path)
+                    return await asyncio.to_thread(_dataframe_response, df, format)
+
+            # Parsing and serialization are CPU-bound; running them on a
+            # worker thread keeps the event loop free to accept other
+            # requests during a multi-second FIT parse.
+            if temp_file_path is None:
+                loader = FitDataLoader.from_bytes(b''.join(chunks), name=file.filename)
+            else:
+                loader = FitDataLoader(temp_file_path)
+            df = await asyncio.to_thread(loader.load)
+
+            if cache_path is not None:
+                # Cache write happens off the event loop; a failed write
+                # only costs the next upload a re-parse.
+                try:
+                    await asyncio.to_thread(df.to_parquet, cache_path, compression='zstd')
+                except Exception:
+                    pass
+
+            return await asyncio.to_thread(_dataframe_response, df, format)
         finally:
             # Clean up temporary file
-            if os.path.exists(temp_file_path):
+            if temp_file is not None and not temp_file.closed:
+                temp_file.close()
+            if temp_file_path is not None and os.path.exists(temp_file_path):
                 os.unlink(temp_file_path)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {e}")
 
-@app.get("/")
-async def main():
-    content = """
+# The landing page is static; encode it once at import and let browsers
+# cache it rather than re-rendering per request.
+_ROOT_HTML = b"""
 <body>
 <form action="/upload/" enctype="multipart/form-data" method="post">
 <input name="file" type="file">
 <input type="submit">
 </form>
 </body>
-    """
-    return HTMLResponse(content=content)
+"""
+
+
+@app.get("/")
+async def main():
+    return Response(
+        content=_ROOT_HTML,
+        media_type="text/html",
+        headers={"Cache-Control": "public, max-age=3600"},
+    )
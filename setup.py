@@ -1,5 +1,13 @@
 from setuptools import setup, find_packages
 
+try:
+    # Optional AOT-compiled kernels; installs fall back to the pure-Python
+    # implementations when Cython (or a compiler) is unavailable.
+    from Cython.Build import cythonize
+    ext_modules = cythonize(['fitanalysis/_kernels.pyx', 'fitanalysis/_fitloader.pyx'])
+except ImportError:
+    ext_modules = []
+
 setup(
     name='fitanalysis',
     version='0.1.0',
@@ -7,11 +15,23 @@ setup(
     author_email='openhands@all-hands.dev',
     description='Library to load and analyze Garmin FIT files',
     packages=find_packages(),
+    ext_modules=ext_modules,
     install_requires=[
         'fitparse>=1.1.0',
         'pandas>=1.0.0',
     ],
     extras_require={
+        'perf': [
+            'bottleneck',  # C rolling-window kernels for NP
+            'numba',       # JIT-fused NP kernel
+            'joblib',      # parallel batch loading
+            'orjson',      # fast config JSON I/O
+            'polars',      # lazy/parallel activity queries
+        ],
+        'dev': [
+            'pytest',
+            'pytest-xdist',  # parallel test runs: pytest -n auto
+        ],
         'web': [
             'fastapi>=0.100.0',
             'uvicorn>=0.22.0',
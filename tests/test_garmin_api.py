@@ -94,6 +94,14 @@ def test_download_activity_fit_success(garmin_api, tmp_path):
         assert metadata_df['activity_id'].iloc[0] == '123'
         assert metadata_df['activity_name'].iloc[0] == 'Test Activity'
 
+def test_download_activities_fit_bulk(garmin_api, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    activity_data = {"activityId": 123, "activityName": "Test Activity", "startTimeGMT": "2025-01-01T10:00:00Z"}
+    with garmin_api.metadata_store:
+        results = garmin_api.download_activities_fit([activity_data])
+    assert results == {123: "activity_123.fit"}
+    assert (tmp_path / "activity_123.fit").read_bytes() == b"dummy_fit_data"
+
 def test_download_activity_fit_connection_error():
     with patch('fitanalysis.garmin_api.Garmin', new=MockGarminClient):
         api = GarminConnectAPI(email="connection_error@example.com", password="password")
@@ -5,8 +5,22 @@ import fitanalysis.loader as loader_module
 from fitanalysis.dummy_data import DummyFitFile
 import os
 
-@pytest.fixture
-def dummy_fit_files(tmp_path):
+# Expected timestamps for dummy.fit, parsed once for the whole module.
+_TS0, _TS1, _TS2 = (
+    pd.Timestamp('2020-01-01T00:00:00Z'),
+    pd.Timestamp('2020-01-01T00:00:01Z'),
+    pd.Timestamp('2020-01-01T00:00:02Z'),
+)
+
+# The dummy inputs are deterministic, so the fixtures are module-scoped:
+# files are written once and the dummy.fit loader (with its parsed
+# DataFrame) is built once instead of per test.
+
+# Session scope is safe here (unlike the FitFile patch): the files are
+# zero-byte stand-ins that no test mutates.
+@pytest.fixture(scope="session")
+def dummy_fit_files(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("fit_files")
     fit_files = {
         "dummy.fit": b"",
         "power_only.fit": b"",
@@ -18,45 +32,73 @@ def dummy_fit_files(tmp_path):
         (tmp_path / name).write_bytes(content)
     return tmp_path
 
-@pytest.fixture(autouse=True)
-def patch_fitfile(monkeypatch):
+# Module scope, not session: a session-wide patch would leak DummyFitFile
+# into test_main.py, whose unmocked-loader tests rely on real fitparse.
+@pytest.fixture(autouse=True, scope="module")
+def patch_fitfile():
+    monkeypatch = pytest.MonkeyPatch()
     monkeypatch.setattr(loader_module, 'FitFile', DummyFitFile)
+    yield
+    monkeypatch.undo()
 
-def test_load_creates_dataframe(dummy_fit_files):
+@pytest.fixture(scope="module")
+def dummy_loader(dummy_fit_files, patch_fitfile):
     loader = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
-    df = loader.data
-    assert list(df.index) == [pd.Timestamp('2020-01-01T00:00:00Z'), pd.Timestamp('2020-01-01T00:00:01Z'), pd.Timestamp('2020-01-01T00:00:02Z')]
+    loader.data  # parse once for every read-only test in the module
+    return loader
+
+@pytest.fixture(params=['load_method', 'data_property'])
+def get_df(request):
+    """Exercises both DataFrame access paths: legacy .load() and .data."""
+    if request.param == 'load_method':
+        return lambda loader: loader.load()
+    return lambda loader: loader.data
+
+def test_load_creates_dataframe(dummy_loader, get_df):
+    df = get_df(dummy_loader)
+    assert list(df.index) == [_TS0, _TS1, _TS2]
     assert 'heart_rate' in df.columns
     assert 'power' in df.columns
-    assert df.loc[pd.Timestamp('2020-01-01T00:00:00Z'), 'heart_rate'] == 100
-    assert df.loc[pd.Timestamp('2020-01-01T00:00:01Z'), 'power'] == 151
-    assert pd.isna(df.loc[pd.Timestamp('2020-01-01T00:00:02Z'), 'heart_rate'])
+    # .at is the scalar label fast path; .loc would run full axis alignment
+    assert df.at[_TS0, 'heart_rate'] == 100
+    assert df.at[_TS1, 'power'] == 151
+    assert pd.isna(df.at[_TS2, 'heart_rate'])
 
-def test_get_heart_rate_series(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
-    hr = loader.get_heart_rate()
+def test_get_heart_rate_series(dummy_loader):
+    hr = dummy_loader.get_heart_rate()
     assert isinstance(hr, pd.Series)
     assert hr.name == 'heart_rate'
     assert hr.iloc[0] == 100
     assert hr.iloc[1] == 101
     assert pd.isna(hr.iloc[2])
 
-def test_get_power_series(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
-    power = loader.get_power()
+def test_get_power_series(dummy_loader):
+    power = dummy_loader.get_power()
     assert isinstance(power, pd.Series)
     assert power.name == 'power'
     assert list(power) == [150, 151, 152]
 
-def test_empty_file(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'empty.fit'))
+@pytest.fixture(scope="module")
+def empty_loader(dummy_fit_files, patch_fitfile):
+    return FitDataLoader(str(dummy_fit_files / 'empty.fit'))
+
+@pytest.fixture(scope="module")
+def power_only_loader(dummy_fit_files, patch_fitfile):
+    return FitDataLoader(str(dummy_fit_files / 'power_only.fit'))
+
+@pytest.fixture(scope="module")
+def hr_only_loader(dummy_fit_files, patch_fitfile):
+    return FitDataLoader(str(dummy_fit_files / 'hr_only.fit'))
+
+def test_empty_file(empty_loader):
+    loader = empty_loader
     df = loader.data
     assert df.empty
     assert loader.get_heart_rate().empty
     assert loader.get_power().empty
 
-def test_power_only(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'power_only.fit'))
+def test_power_only(power_only_loader):
+    loader = power_only_loader
     df = loader.data
     assert 'heart_rate' not in df.columns
     assert 'power' in df.columns
@@ -65,8 +107,8 @@ def test_power_only(dummy_fit_files):
     power = loader.get_power()
     assert list(power) == [200, 201]
 
-def test_hr_only(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'hr_only.fit'))
+def test_hr_only(hr_only_loader):
+    loader = hr_only_loader
     df = loader.data
     assert 'heart_rate' in df.columns
     assert 'power' not in df.columns
@@ -75,6 +117,13 @@ def test_hr_only(dummy_fit_files):
     power = loader.get_power()
     assert power.empty
 
+def test_cached_parse_is_isolated(dummy_fit_files):
+    """Mutating one loader's data must not leak into other loaders."""
+    a = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
+    b = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
+    a.data['extra'] = 1.0
+    assert 'extra' not in b.data.columns
+
 def test_corrupt_file(dummy_fit_files):
     loader = FitDataLoader(str(dummy_fit_files / 'corrupt.fit'))
     with pytest.raises(FitFileCorruptedError, match="Error parsing FIT file.*Corrupted file"):
@@ -87,26 +136,39 @@ def test_max_power_by_time(dummy_fit_files):
     max_power = FitDataLoader.max_power_by_time(str(dummy_fit_files / 'dummy.fit'))
     assert isinstance(max_power, pd.Series)
     assert max_power.to_dict() == {
-        pd.to_datetime('2020-01-01T00:00:00Z').time(): 150,
-        pd.to_datetime('2020-01-01T00:00:01Z').time(): 151,
-        pd.to_datetime('2020-01-01T00:00:02Z').time(): 152,
+        _TS0.time(): 150,
+        _TS1.time(): 151,
+        _TS2.time(): 152,
     }
 
-def test_get_normalized_power(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
-    np_value = loader.get_normalized_power()
+def test_load_many(dummy_fit_files):
+    paths = [str(dummy_fit_files / 'dummy.fit'), str(dummy_fit_files / 'power_only.fit')]
+    # n_jobs=1 keeps the map in-process, where DummyFitFile is patched
+    result = FitDataLoader.load_many(paths, n_jobs=1)
+    assert sorted(result) == sorted(paths)
+    assert list(result[paths[0]]['power']) == [150, 151, 152]
+    assert list(result[paths[1]]['power']) == [200, 201]
+    assert FitDataLoader.load_many([], n_jobs=1) == {}
+
+def test_normalized_power_many(dummy_fit_files):
+    paths = [str(dummy_fit_files / 'dummy.fit')]
+    series = FitDataLoader.normalized_power_many(paths, n_jobs=1)
+    assert list(series.index) == paths
+    assert series.iloc[0] == pytest.approx(150.66, rel=1e-2)
+    assert FitDataLoader.normalized_power_many([], n_jobs=1).empty
+
+def test_get_normalized_power(dummy_loader):
+    np_value = dummy_loader.get_normalized_power()
     assert np_value == pytest.approx(150.66, rel=1e-2)
 
-def test_get_intensity_factor(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
+def test_get_intensity_factor(dummy_loader):
     ftp = 200
-    if_value = loader.get_intensity_factor(ftp)
+    if_value = dummy_loader.get_intensity_factor(ftp)
     assert if_value == pytest.approx(0.7533, rel=1e-2)
 
-def test_get_training_stress_score(dummy_fit_files):
-    loader = FitDataLoader(str(dummy_fit_files / 'dummy.fit'))
+def test_get_training_stress_score(dummy_loader):
     ftp = 200
-    tss_value = loader.get_training_stress_score(ftp)
+    tss_value = dummy_loader.get_training_stress_score(ftp)
     assert tss_value == pytest.approx(0.0315, rel=1e-2)
 
 def test_file_not_found():